@@ -1,14 +1,24 @@
 import argparse
+import collections
+import concurrent.futures
+import functools
 import itertools
 import json
+import multiprocessing
+import os
+import queue
 import shutil
 import site
+import subprocess
 import sys
+import textwrap
+import threading
 import warnings
+import weakref
 import webbrowser
-from collections.abc import Generator
+from collections.abc import Generator, MutableMapping
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 import pdoc
 import pdoc.doc
@@ -19,58 +29,290 @@ from tqdm import tqdm
 
 DEFAULT_IGNORE = {"!idlelib", "!idlelib.", "!turtledemo.", "!lib2to3."}
 
+try:
+    import liburing
+except ImportError:
+    liburing = None  # type: ignore[assignment]
+
+try:
+    import orjson
+
+    def _json_dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+except ImportError:
+
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _template(name: str) -> pdoc.render.jinja2.Template:
+    """Look up a template once per process; must run after `pdoc.render.configure`."""
+    return pdoc.render.env.get_template(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _node_executable() -> str:
+    return "nodejs" if shutil.which("nodejs") else "node"
+
+
+def _precompile_index(payload: bytes, compile_js: Path) -> str:
+    """Precompile the Elasticlunr.js search index with Node, like `pdoc.search.precompile_index`.
+
+    Takes the index pre-serialized so the payload streams straight into the subprocess without
+    another serialization pass; falls back to the raw index (compiled client-side) if Node fails.
+    """
+    try:
+        out = subprocess.check_output(
+            [_node_executable(), compile_js],
+            input=payload,
+            cwd=compile_js.parent,
+            stderr=subprocess.STDOUT,
+        )
+        index = _json_loads(out)
+        index["_isPrebuiltIndex"] = True
+    except Exception as exc:
+        print(f"Failed to precompile the search index: {exc}\nSearch will work, but may be slower.")
+        if isinstance(exc, subprocess.CalledProcessError):
+            print(textwrap.indent(exc.output.decode("utf-8", "replace"), "    ").rstrip())
+        return payload.decode("utf-8")
+    return _json_dumps(index).decode("utf-8")
+
+
+class AsyncArtifactWriter:
+    """Writes artifacts to disk from a background thread so writes overlap with rendering.
+
+    On Linux with `liburing` installed, each batch of files is submitted to an io_uring as
+    linked write+close chains, so the writes and closes cost one submit syscall per batch;
+    only the open remains a syscall per file.
+    """
+
+    batch_size = 64
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.queue: queue.Queue[tuple[Path, bytes] | None] = queue.Queue(maxsize=capacity)
+        self.error: OSError | None = None
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def put(self, path: Path, data: bytes) -> None:
+        self.queue.put((path, data))
+
+    def join(self) -> None:
+        """Block until every queued write has hit the disk, raising the first write failure."""
+        self.queue.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self) -> None:
+        """Flush outstanding writes, stop the writer thread, and raise the first write failure."""
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _fail(self, exc: OSError) -> None:
+        if self.error is None:
+            self.error = exc
+
+    def _drain(self) -> None:
+        ring = None
+        if sys.platform == "linux" and liburing is not None:
+            ring = liburing.Ring()
+            liburing.io_uring_queue_init(2 * self.batch_size, ring)
+        try:
+            while True:
+                if (item := self.queue.get()) is None:
+                    self.queue.task_done()
+                    return
+                batch = [item]
+                closing = False
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+                try:
+                    if ring is not None:
+                        self._write_uring(ring, batch)
+                    else:
+                        for path, data in batch:
+                            try:
+                                path.write_bytes(data)
+                            except OSError as exc:
+                                self._fail(exc)
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+                    if closing:
+                        self.queue.task_done()
+                if closing:
+                    return
+        finally:
+            if ring is not None:
+                liburing.io_uring_queue_exit(ring)
+
+    def _write_uring(self, ring: Any, batch: list[tuple[Path, bytes]]) -> None:
+        fds = []
+        ok = True
+        try:
+            for index, (path, data) in enumerate(batch):
+                fds.append(fd := os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666))
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_write(sqe, fd, data)
+                sqe.flags = liburing.IOSQE_IO_LINK
+                sqe.user_data = index
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_close(sqe, fd)
+                sqe.user_data = len(batch) + index
+        except OSError:
+            ok = False
+
+        # Submit whatever made it into the ring and drain every completion, so a mid-batch
+        # failure cannot desync the next batch's accounting. The binding raises OSError from
+        # wait_cqe for a CQE carrying a negative res, leaving the entry unconsumed; it then
+        # cannot tell us which op failed, so any anomaly falls back to rewriting the batch.
+        pending = liburing.io_uring_submit(ring)
+        cqe = liburing.Cqe()
+        closed: set[int] = set()
+        while pending:
+            try:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                if entry.user_data >= len(batch):
+                    closed.add(entry.user_data - len(batch))
+                elif entry.res != len(batch[entry.user_data][1]):
+                    ok = False
+            except OSError:
+                ok = False
+            liburing.io_uring_cq_advance(ring, 1)
+            pending -= 1
+
+        if not ok:
+            # A failed write cancels its linked close. Only re-close fds whose close never
+            # completed: the rest are released, and their numbers may already be recycled by
+            # the main thread's own files.
+            for index, fd in enumerate(fds):
+                if index not in closed:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+            for path, data in batch:
+                try:
+                    path.write_bytes(data)
+                except OSError as exc:
+                    self._fail(exc)
+
 
 class Cache[K, V]:
+    _TR = str.maketrans(".", "/")
+    memory_limit = 256
+
     def __init__(self, path: Path) -> None:
         self.path = path
         path.mkdir(parents=True, exist_ok=True)
+        self.writer = AsyncArtifactWriter()
+        self._manifest = {Path(root, name) for root, _, files in os.walk(path) for name in files}
+        self._key_cache: MutableMapping[K, Path] = {}
+        self._dirs: set[Path] = {path}
+        self._memory: collections.OrderedDict[Path, V] = collections.OrderedDict()
 
-    def key(self, key: K) -> Path:
-        return Path(str(key))
+    def key(self, key: K) -> str:
+        return str(key)
+
+    def _resolve(self, key: K) -> Path:
+        if (path := self._key_cache.get(key)) is None:
+            path = self._key_cache[key] = self.path / self.key(key)
+        return path
 
     def save(self, path: Path, value: V) -> None: ...
     def load(self, path: Path) -> V: ...
     def compute(self, key: K) -> V: ...
 
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        self.writer.close()
+
+    def _remember(self, path: Path, value: V) -> None:
+        self._memory[path] = value
+        self._memory.move_to_end(path)
+        while len(self._memory) > self.memory_limit:
+            self._memory.popitem(last=False)
+
     def get(self, key: K) -> V:
-        try:
-            return self[key]
-        except KeyError:
-            value = self.compute(key)
-            self[key] = value
-            return value
+        path = self._resolve(key)
+        if path in self._memory:
+            self._memory.move_to_end(path)
+            return self._memory[path]
+        if path in self._manifest:
+            try:
+                value = self.load(path)
+            except FileNotFoundError:
+                pass  # Evicted from memory whilst its write is still queued; recompute.
+            else:
+                self._remember(path, value)
+                return value
+        value = self.compute(key)
+        self[key] = value
+        return value
 
     def __getitem__(self, key: K) -> V:
-        path = self.path / self.key(key)
-        if not path.exists():
+        path = self._resolve(key)
+        if path in self._memory:
+            self._memory.move_to_end(path)
+            return self._memory[path]
+        if path not in self._manifest:
             raise KeyError(key)
-        return self.load(path)
+        try:
+            value = self.load(path)
+        except FileNotFoundError:
+            raise KeyError(key) from None
+        self._remember(path, value)
+        return value
 
     def __setitem__(self, key: K, value: V) -> None:
-        path = self.path / self.key(key)
-        path.parent.mkdir(parents=True, exist_ok=True)
+        path = self._resolve(key)
+        parent = path.parent
+        if parent not in self._dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(parent)
         self.save(path, value)
+        self._manifest.add(path)
+        self._remember(path, value)
 
     def __delitem__(self, key: K) -> None:
-        path = self.path / self.key(key)
+        path = self._resolve(key)
         if path.exists():
             path.unlink()
+        self._manifest.discard(path)
+        self._memory.pop(path, None)
 
     def __contains__(self, key: K) -> bool:
-        path = self.path / self.key(key)
-        return path.exists()
+        return self._resolve(key) in self._manifest
 
 
 class CacheHTML(Cache[pdoc.doc.Module, str]):
     def __init__(self, path: Path, modules: dict[str, pdoc.doc.Module]) -> None:
         super().__init__(path)
         self.modules = modules
+        self._key_cache = weakref.WeakKeyDictionary()
 
-    def key(self, key: pdoc.doc.Module) -> Path:
-        return Path(key.fullname.replace(".", "/") + ".html")
+    def key(self, key: pdoc.doc.Module) -> str:
+        return key.fullname.translate(self._TR) + ".html"
 
     def save(self, path: Path, value: str) -> None:
-        path.write_text(value, encoding="utf-8")
+        self.writer.put(path, value.encode("utf-8"))
 
     def load(self, path: Path) -> str:
         return path.read_text(encoding="utf-8")
@@ -79,96 +321,189 @@ class CacheHTML(Cache[pdoc.doc.Module, str]):
         return pdoc.render.html_module(key, self.modules)
 
 
-class CacheIndex(Cache[tuple[str, pdoc.doc.Module], list[dict]]):
-    def __init__(self, path: Path, modules: dict[str, pdoc.doc.Module]) -> None:
+class CacheIndex(Cache[tuple[str, pdoc.doc.Module], bytes]):
+    def __init__(self, path: Path, modules: dict[str, pdoc.doc.Module], docformat: str) -> None:
         super().__init__(path)
-
-        module_template: pdoc.render.jinja2.Template = pdoc.render.env.get_template("module.html.jinja2")
-        self.ctx: pdoc.render.jinja2.runtime.Context = module_template.new_context(
-            {"module": pdoc.doc.Module(pdoc.render.types.ModuleType("")), "all_modules": modules}
+        self.modules = modules
+        self._docformat = docformat
+        self._one: dict[str, pdoc.doc.Module] = {}
+
+    @functools.cached_property
+    def _public(self) -> Any:
+        """The `is_public` macro, bound by evaluating the module template against an empty module.
+
+        Executing the template is the only way to get at the macro, so it is deferred until a
+        module actually needs indexing; fully cached runs never pay for it.
+        """
+        module_template = _template("module.html.jinja2")
+        ctx: pdoc.render.jinja2.runtime.Context = module_template.new_context(
+            {"module": pdoc.doc.Module(pdoc.render.types.ModuleType("")), "all_modules": self.modules}
         )
-        for _ in module_template.root_render_func(self.ctx):  # type: ignore
+        for _ in module_template.root_render_func(ctx):  # type: ignore
             pass
+        return ctx["is_public"]
 
-    def key(self, key: tuple[str, pdoc.doc.Module]) -> Path:
-        return Path(key[0].replace(".", "/") + ".json")
+    def key(self, key: tuple[str, pdoc.doc.Module]) -> str:
+        return key[0].translate(self._TR) + ".json"
 
-    def save(self, path: Path, value: list[dict]) -> None:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(value, f)
+    def save(self, path: Path, value: bytes) -> None:
+        self.writer.put(path, value)
 
-    def load(self, path: Path) -> list[dict]:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+    def load(self, path: Path) -> bytes:
+        return path.read_bytes()
 
-    def compute(self, key: tuple[str, pdoc.doc.Module]) -> list[dict]:
-        return pdoc.search.make_index(
-            dict([key]),
-            self._is_public,
-            cast(str, pdoc.render.env.globals["docformat"]),
-        )
+    def compute(self, key: tuple[str, pdoc.doc.Module]) -> bytes:
+        self._one.clear()
+        self._one[key[0]] = key[1]
+        return _json_dumps(pdoc.search.make_index(self._one, self._is_public, self._docformat))
 
     def _is_public(self, x: pdoc.doc.Doc) -> bool:
-        return bool(self.ctx["is_public"](x).strip())
+        return bool(self._public(x).strip())
 
 
 def search_index(modules: dict[str, pdoc.doc.Module], cache_path: Path) -> str:
     """Renders the Elasticlunr.js search index."""
-    cache = CacheIndex(cache_path, modules)
-    if not pdoc.render.env.globals["search"]:
+    env_globals = pdoc.render.env.globals
+    if not env_globals["search"]:
         return ""
+    cache = CacheIndex(cache_path, modules, cast(str, env_globals["docformat"]))
 
-    index = [
-        idx for name, mod in tqdm(modules.items(), "Indexing modules", unit="modules") for idx in cache.get((name, mod))
+    chunks = [
+        chunk
+        for name, mod in tqdm(modules.items(), "Indexing modules", unit="modules")
+        if len(chunk := cache.get((name, mod))) > 2
     ]
+    cache.close()
 
     print("Compiling Search Index...")
-    compile_js = Path(pdoc.render.env.get_template("build-search-index.js").filename)  # type: ignore
-    return pdoc.render.env.get_template("search.js.jinja2").render(
-        search_index=pdoc.search.precompile_index(index, compile_js)
-    )
+    compile_js = Path(_template("build-search-index.js").filename)  # type: ignore
+    payload = b"[" + b",".join(chunk[1:-1] for chunk in chunks) + b"]"
+    return _template("search.js.jinja2").render(search_index=_precompile_index(payload, compile_js))
 
 
-def render_modules(modules: dict[str, pdoc.doc.Module], output_directory: Path) -> None:
-    cache = CacheHTML(output_directory, modules)
+_render_state: dict[str, pdoc.doc.Module] = {}
+
+
+def _render_initialize(names: list[str]) -> None:
+    """Prepare a render worker by loading the target modules into the process.
+
+    Forked workers inherit the parent's already-imported table and skip straight out; spawned
+    workers (Windows) have to reconfigure and reimport everything from the names alone.
+    """
+    if _render_state:
+        return
+    pdoc.render.configure(math=True, mermaid=True)
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
+        for name in names:
+            try:
+                _render_state[name] = pdoc.doc.Module.from_name(name)
+            except RuntimeError:
+                pass
 
-        for name, module in (pbar := tqdm(modules.items(), "Rendering modules", unit="modules")):
-            pbar.set_postfix({"module": name})
-            if module not in cache:
-                cache[module] = cache.compute(module)
+
+def _render_compute(name: str) -> tuple[str, str | None]:
+    # On the spawn fallback the initializer swallows failed imports, so the module may be absent.
+    if (module := _render_state.get(name)) is None:
+        return name, None
+    return name, pdoc.render.html_module(module, _render_state)
+
+
+def render_modules(modules: dict[str, pdoc.doc.Module], output_directory: Path) -> None:
+    cache = CacheHTML(output_directory, modules)
+    pending = [name for name, module in modules.items() if module not in cache]
+    if pending:
+        mp = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        if mp.get_start_method() == "fork":
+            _render_state.update(modules)
+        try:
+            with (
+                warnings.catch_warnings(),
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=mp,
+                    initializer=_render_initialize,
+                    initargs=(list(modules),),
+                ) as executor,
+            ):
+                warnings.simplefilter("ignore")
+
+                futures = {executor.submit(_render_compute, name): name for name in pending}
+                for future in (
+                    pbar := tqdm(
+                        concurrent.futures.as_completed(futures), "Rendering modules", total=len(pending), unit="modules"
+                    )
+                ):
+                    name, html = future.result()
+                    pbar.set_postfix({"module": name})
+                    if html is None:
+                        pbar.write(f"Skipped rendering {name}: the module failed to import in its worker")
+                        continue
+                    cache[modules[name]] = html
+        finally:
+            # Workers have forked (or been sent the names) by now; unpin the Module trees so a
+            # later build in the same process cannot resolve links against a stale merged table.
+            _render_state.clear()
 
     index = pdoc.render.html_index(modules)
     if index:
-        (output_directory / "index.html").write_bytes(index.encode())
+        cache.writer.put(output_directory / "index.html", index.encode("utf-8"))
 
     search = search_index(modules, output_directory / ".cache" / "search")
     if search:
-        (output_directory / "search.js").write_bytes(search.encode())
+        cache.writer.put(output_directory / "search.js", search.encode("utf-8"))
+    cache.close()
 
 
 def load_modules(modules: list[str]) -> dict[str, pdoc.doc.Module]:
     loaded = {}
     invalid = set()
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-
-        for name in (pbar := tqdm(pdoc.extract.walk_specs(modules), "Loading modules", unit="modules")):
-            pbar.set_postfix({"module": name})
-            try:
-                if name in invalid:
-                    continue
-                loaded[name] = pdoc.doc.Module.from_name(name)
-            except RuntimeError as exc:
-                if "Error importing" in str(exc):
+    names = sorted(pdoc.extract.walk_specs(modules))
+    # pdoc mock-patches subprocess/stdio around every import; concurrent imports
+    # race on the unpatching, so snapshot the originals and restore them after.
+    side_effects = subprocess.Popen, sys.stdout, sys.stderr, sys.stdin
+    try:
+        with (
+            warnings.catch_warnings(),
+            concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor,
+            tqdm(total=len(names), desc="Loading modules", unit="modules") as pbar,
+        ):
+            warnings.simplefilter("ignore")
+
+            # Submit one depth level at a time, so a package's failure is known before any of
+            # its children are submitted and their imports never run at all.
+            waves: dict[int, list[str]] = {}
+            for name in names:
+                waves.setdefault(name.count("."), []).append(name)
+            for depth in sorted(waves):
+                futures = {}
+                for name in waves[depth]:
                     parts = name.split(".")
-                    invalid |= {".".join(name[:i]) for i in range(1, len(parts))}
-    return {
-        name: mod
-        for name, mod in sorted(loaded.items(), key=lambda x: (int(bool(x[0].count("."))), x[0]))
-        if name not in invalid
-    }
+                    if any(".".join(parts[:i]) in invalid for i in range(1, len(parts) + 1)):
+                        pbar.update()
+                        continue
+                    futures[name] = executor.submit(pdoc.doc.Module.from_name, name)
+                for index, (name, future) in enumerate(futures.items()):
+                    if not index & 0x1F:
+                        pbar.set_postfix({"module": name})
+                    try:
+                        loaded[name] = future.result()
+                    except RuntimeError as exc:
+                        if "Error importing" in str(exc):
+                            parts = name.split(".")
+                            invalid |= {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+                    pbar.update()
+    finally:
+        subprocess.Popen, sys.stdout, sys.stderr, sys.stdin = side_effects
+    tops: list[tuple[str, pdoc.doc.Module]] = []
+    subs: list[tuple[str, pdoc.doc.Module]] = []
+    for name, mod in loaded.items():
+        if name in invalid:
+            continue
+        (subs if "." in name else tops).append((name, mod))
+    tops.sort()
+    subs.sort()
+    return dict(tops + subs)
 
 
 def build_modules(modules: list[str], output: Path) -> set[str]: